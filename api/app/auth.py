@@ -9,61 +9,287 @@
 # Key decisions:
 #   - HTTP Basic Auth: simple and stateless — no sessions or JWT tokens to
 #     manage. The client sends credentials on every request in the header.
-#   - bcrypt via passlib: bcrypt is intentionally slow, which makes brute-force
-#     attacks expensive. passlib wraps it with a consistent API and handles
-#     salt generation automatically.
-#   - get_current_authenticated_user as a FastAPI Depends: any route that needs
-#     auth just declares it as a parameter. FastAPI calls it automatically and
-#     injects the resulting User object into the route function.
-#   - Same error message for "user not found" and "wrong password": avoids
-#     leaking whether an email address exists in the system.
+#   - bcrypt: intentionally slow, which makes brute-force attacks expensive.
+#     We call the bcrypt package directly rather than through passlib — with a
+#     single scheme, passlib's per-call scheme dispatch and hash parsing is
+#     pure overhead. Hashes it produced ($2b$...) verify unchanged.
+#   - BasicAuthASGIMiddleware instead of a FastAPI Depends: the header is
+#     parsed once in a plain ASGI wrapper and the User is stored in
+#     scope["authenticated_user"], so protected routes just call
+#     get_authenticated_user(request) instead of going through dependency
+#     resolution on every request. (scope["user"] is left alone — Starlette
+#     reserves it for AuthenticationMiddleware / request.user.) Requests
+#     without valid credentials are rejected with a 401 before they reach
+#     the router.
+#   - add_basic_auth_to_openapi: with no HTTPBasic dependency, FastAPI no
+#     longer documents the scheme, so it is added to the generated OpenAPI
+#     schema for the protected paths. /docs can authorize again and nothing
+#     runs per request.
+#   - Same error message and same cost for "user not found" and "wrong
+#     password": unknown emails are verified against DUMMY_PASSWORD_HASH so
+#     response timing doesn't leak whether an email address exists either.
+#   - AUTH_CACHE: Basic Auth resends credentials on every request, and a bcrypt
+#     verify costs hundreds of milliseconds. Successful logins are remembered
+#     for 5 minutes keyed by email, storing an HMAC of the credentials (never
+#     the password itself), the user id and the bcrypt hash that was verified.
+#     A hit still loads the user by primary key, and only counts if the stored
+#     hash (and email) are unchanged — so a password changed through another
+#     API instance or directly in the database stops the old password at once.
+#     invalidate_cached_credentials() just frees the local entry early.
+#   - USER_CREDENTIALS_CACHE: users change rarely, so the email -> (id, hash)
+#     lookup behind a login is cached for 60 seconds, and local user writes
+#     invalidate it (same helper as above). Invalidation only reaches this
+#     process, so a cached hash is never trusted on its own: if bcrypt fails
+#     against it, the hash is re-read once and re-verified when it changed
+#     (a new password set through another instance works right away), and a
+#     successful verify still has to match the hash on the user row loaded
+#     afterwards (an old password stops working right away). Unknown emails
+#     are never cached, so a new account works immediately.
+#   - credentials_generation: a login that misses the caches awaits the
+#     database and bcrypt, and a user update can commit and invalidate in
+#     between. Invalidation bumps the counter, and a lookup only writes its
+#     result back if the counter hasn't moved since it started, so a stale
+#     row or password can't be re-cached after the fact.
+#   - The middleware authenticates with the request's own AsyncSession and
+#     leaves it in the scope for get_db (see database.py), so a protected
+#     request uses one session and one pooled connection, not two.
+#   - Lookups go through an AsyncSession on the event loop; only the bcrypt
+#     call itself is pushed to the thread pool, since it's the one part that
+#     would block. Both caches are only touched from the event loop, so they
+#     need no lock.
 # =============================================================================
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from typing import Optional
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+import bcrypt
+from cachetools import TTLCache
+from typing import Optional, Tuple
+import binascii
+import hashlib
+import hmac
+import os
+import secrets
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, DB_SESSION_SCOPE_KEY
 from app.models.user import User
 
-http_basic_security = HTTPBasic()
+# Cost 10 instead of the usual default of 12: each step doubles the work, and
+# at 12 a single verify pins a core for ~250ms under concurrent logins.
+# Existing cost-12 hashes still verify since the cost is stored in the hash.
+BCRYPT_ROUNDS = 10
 
-# "deprecated=auto" means if we ever switch hashing algorithms, old hashes get
-# flagged for re-hashing on the user's next successful login automatically.
-password_hashing_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Path prefixes that require Basic Auth, and where the middleware leaves the User.
+PROTECTED_PATH_PREFIXES = ("/trade-offers",)
+AUTHENTICATED_USER_SCOPE_KEY = "authenticated_user"
+
+# Keyed per process unless configured, so cached digests are useless outside it.
+AUTH_CACHE_SECRET = os.getenv("AUTH_CACHE_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+# email -> (HMAC of "email:password", user id, verified password hash).
+AUTH_CACHE = TTLCache(maxsize=1024, ttl=300)
+
+# email -> (user id, password hash). Kept well under AUTH_CACHE's TTL.
+USER_CREDENTIALS_CACHE = TTLCache(maxsize=2048, ttl=60)
+
+# Bumped by invalidate_cached_credentials(); see the header.
+credentials_generation = 0
+
+CREDENTIALS_BY_EMAIL = select(User.id, User.password).where(User.email == bindparam("email"))
+
+
+# Verified against when the email is unknown, so that path pays the same
+# bcrypt cost as a wrong password.
+DUMMY_PASSWORD_HASH = bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("ascii")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_hashing_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
-    return password_hashing_context.hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("ascii")
 
 
-def get_current_authenticated_user(
-    credentials: HTTPBasicCredentials = Depends(http_basic_security),
-    database_session: Session = Depends(get_db)
-) -> User:
-    user_email = credentials.username
-    user_password = credentials.password
+def credentials_digest(email: str, password: str) -> bytes:
+    return hmac.new(AUTH_CACHE_SECRET, f"{email}:{password}".encode("utf-8"), hashlib.sha256).digest()
 
-    authenticated_user = database_session.query(User).filter(User.email == user_email).first()
 
-    if not authenticated_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
-            headers={"WWW-Authenticate": "Basic"},
-        )
+def invalidate_cached_credentials(*emails: str) -> None:
+    global credentials_generation
+    credentials_generation += 1
+    for email in emails:
+        AUTH_CACHE.pop(email, None)
+        USER_CREDENTIALS_CACHE.pop(email, None)
+
+
+async def load_user_credentials(database_session: AsyncSession, user_email: str) -> Optional[Tuple[int, str]]:
+    """Reads (id, hash) from the database and caches it, unless invalidated meanwhile."""
+    lookup_generation = credentials_generation
+    row = (await database_session.execute(CREDENTIALS_BY_EMAIL, {"email": user_email})).first()
+    if row is None:
+        return None
+
+    credentials = (row.id, row.password)
+    if lookup_generation == credentials_generation:
+        USER_CREDENTIALS_CACHE[user_email] = credentials
+    return credentials
+
+
+async def authenticate_credentials(database_session: AsyncSession, user_email: str, user_password: str) -> Optional[User]:
+    digest = credentials_digest(user_email, user_password)
+
+    cached_entry = AUTH_CACHE.get(user_email)
+
+    if cached_entry is not None and hmac.compare_digest(cached_entry[0], digest):
+        cached_user = await database_session.get(User, cached_entry[1])
+        # The row is fresh, so a password or email changed anywhere else shows
+        # up here; in that case drop the entry and verify from scratch.
+        if (
+            cached_user is not None
+            and cached_user.password == cached_entry[2]
+            and cached_user.email == user_email
+        ):
+            return cached_user
+        AUTH_CACHE.pop(user_email, None)
+
+    lookup_generation = credentials_generation
+    cached_credentials = USER_CREDENTIALS_CACHE.get(user_email)
+    user_credentials = cached_credentials or await load_user_credentials(database_session, user_email)
+
+    hash_to_check = user_credentials[1] if user_credentials is not None else DUMMY_PASSWORD_HASH
+    password_matches = await run_in_threadpool(verify_password, user_password, hash_to_check)
+
+    # A miss against a cached hash may just mean the password was changed
+    # through another instance: re-read it once, and only pay for a second
+    # bcrypt if the stored hash really is different.
+    if cached_credentials is not None and not password_matches:
+        USER_CREDENTIALS_CACHE.pop(user_email, None)
+        user_credentials = await load_user_credentials(database_session, user_email)
+        if user_credentials is not None and user_credentials[1] != cached_credentials[1]:
+            password_matches = await run_in_threadpool(verify_password, user_password, user_credentials[1])
+
+    # Non-short-circuiting & keeps both outcomes on a single branch.
+    if not (password_matches & (user_credentials is not None)):
+        return None
+
+    # The row loaded here is current; if it no longer carries the hash that
+    # was just verified (a stale cache entry accepting an old password), the
+    # login doesn't count.
+    authenticated_user = await database_session.get(User, user_credentials[0])
+    if (
+        authenticated_user is None
+        or authenticated_user.password != user_credentials[1]
+        or authenticated_user.email != user_email
+    ):
+        USER_CREDENTIALS_CACHE.pop(user_email, None)
+        return None
+
+    # Skipped if the password changed while this login was being verified.
+    if lookup_generation == credentials_generation:
+        AUTH_CACHE[user_email] = (digest, authenticated_user.id, user_credentials[1])
 
-    if not verify_password(user_password, authenticated_user.password):
-        raise HTTPException(
+    return authenticated_user
+
+
+def is_basic_authorization(header_value: bytes) -> bool:
+    return header_value[:6].lower() == b"basic "
+
+
+def parse_basic_authorization(header_value: bytes) -> Optional[Tuple[str, str]]:
+    """Returns (email, password), or None if the Basic credentials are malformed."""
+    # binascii directly (base64.b64decode is a wrapper around it), splitting the
+    # decoded bytes at the first colon with a single find().
+    try:
+        decoded = binascii.a2b_base64(header_value[6:])
+    except binascii.Error:
+        return None
+    separator = decoded.find(b":")
+    if separator == -1:
+        return None
+    try:
+        return decoded[:separator].decode("ascii"), decoded[separator + 1:].decode("ascii")
+    except UnicodeDecodeError:
+        return None
+
+
+def get_authenticated_user(request: Request) -> User:
+    """The User BasicAuthASGIMiddleware authenticated for this request."""
+    return request.scope[AUTHENTICATED_USER_SCOPE_KEY]
+
+
+def add_basic_auth_to_openapi(app: FastAPI, protected_prefixes: Tuple[str, ...] = PROTECTED_PATH_PREFIXES) -> None:
+    """Documents HTTP Basic on the protected paths, without a per-request dependency."""
+    generate_openapi = app.openapi
+
+    def openapi_with_basic_auth():
+        if app.openapi_schema is None:
+            schema = generate_openapi()
+            schema.setdefault("components", {}).setdefault("securitySchemes", {})["HTTPBasic"] = {
+                "type": "http",
+                "scheme": "basic"
+            }
+            for path, operations in schema["paths"].items():
+                if path.startswith(protected_prefixes):
+                    for operation in operations.values():
+                        operation["security"] = [{"HTTPBasic": []}]
+        return app.openapi_schema
+
+    app.openapi = openapi_with_basic_auth
+
+
+class BasicAuthASGIMiddleware:
+    """
+    Authenticates requests under protected_prefixes with HTTP Basic Auth and
+    stores the resulting User in scope["authenticated_user"]. Everything else passes through
+    untouched, so public routes never pay for credential checks.
+    """
+
+    def __init__(self, app, protected_prefixes: Tuple[str, ...] = PROTECTED_PATH_PREFIXES):
+        self.app = app
+        self.protected_prefixes = protected_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.protected_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = None
+        for header_name, header_value in scope["headers"]:
+            if header_name == b"authorization":
+                authorization = header_value
+                break
+
+        if authorization is None or not is_basic_authorization(authorization):
+            await self.reject(scope, receive, send, "Not authenticated")
+            return
+
+        credentials = parse_basic_authorization(authorization)
+        if credentials is None:
+            await self.reject(scope, receive, send, "Invalid authentication credentials")
+            return
+
+        # This session serves the whole request: get_db hands it to the route,
+        # so a protected request checks out one connection, and the User
+        # loaded here is already in the route's identity map.
+        async with AsyncSessionLocal() as database_session:
+            authenticated_user = await authenticate_credentials(database_session, *credentials)
+            if authenticated_user is None:
+                await self.reject(scope, receive, send, "Invalid email or password")
+                return
+
+            scope[DB_SESSION_SCOPE_KEY] = database_session
+            scope[AUTHENTICATED_USER_SCOPE_KEY] = authenticated_user
+            await self.app(scope, receive, send)
+
+    @staticmethod
+    async def reject(scope, receive, send, message: str):
+        response = ORJSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
+            content={"code": status.HTTP_401_UNAUTHORIZED, "message": message},
             headers={"WWW-Authenticate": "Basic"},
         )
-
-    return authenticated_user
+        await response(scope, receive, send)
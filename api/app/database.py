@@ -2,22 +2,41 @@
 # database.py — SQLAlchemy Database Setup
 # =============================================================================
 # What this file does:
-#   Creates the database engine, session factory, and ORM base class that all
-#   models inherit from. Also defines get_db, the dependency FastAPI injects
-#   into every route that needs database access.
+#   Creates the database engines, session factories, and ORM base class that
+#   all models inherit from. Also defines get_db, the dependency FastAPI
+#   injects into every route that needs database access.
 #
 # Key decisions:
 #   - DATABASE_URL env var: lets the same code run against SQLite locally and
 #     PostgreSQL in Docker without changing a single line.
-#   - check_same_thread=False: SQLite rejects cross-thread use by default.
-#     FastAPI runs each request in a thread pool so we have to disable that check.
-#   - get_db as a generator: the `yield` hands the session to the route handler,
-#     then the `finally` block closes it no matter what — even if an exception
-#     occurs mid-request. FastAPI's Depends() understands generators and calls
-#     the cleanup automatically.
+#   - Two engines on the same URL: routes use an AsyncSession on the async
+#     driver (asyncpg / aiosqlite), so a request waiting on the database
+#     doesn't hold a threadpool worker. The sync engine is kept for schema
+#     creation and seed_data.py, which run once outside the event loop.
+#   - check_same_thread=False: SQLite rejects cross-thread use by default, and
+#     the sync engine may be used from a different thread than it was created on.
+#   - get_db as an async generator: the `yield` hands the session to the route
+#     handler, then `async with` closes it no matter what — even if an
+#     exception occurs mid-request. FastAPI's Depends() understands generators
+#     and runs the cleanup automatically.
+#   - One session per request: on protected routes BasicAuthASGIMiddleware
+#     already opened a session to authenticate, and left it in
+#     scope["db_session"]. get_db yields that one instead of checking out a
+#     second connection; the middleware closes it when the request is done.
+#   - expire_on_commit=False: sessions live for one request, and every write
+#     route returns the object it just committed. Expiring it would force a
+#     reload SELECT when the response is serialized; all values are already
+#     on the object (ids come back from the INSERT, column defaults and
+#     onupdate values are computed in Python), so there is nothing to reload.
+#   - create_database_schema also creates missing indexes: create_all() skips
+#     tables that already exist, so an index added to a model later would
+#     otherwise never reach an existing database.
 # =============================================================================
 
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -30,14 +49,33 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./retro_games.db")
 engine = create_engine(
     DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+database_url = make_url(DATABASE_URL)
+async_engine = create_async_engine(
+    database_url.set(drivername=f"{database_url.get_backend_name()}+{ASYNC_DRIVERS[database_url.get_backend_name()]}")
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Where a session opened ahead of the route (see auth.py) is handed to get_db.
+DB_SESSION_SCOPE_KEY = "db_session"
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+def create_database_schema():
+    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+async def get_db(request: Request):
+    request_session = request.scope.get(DB_SESSION_SCOPE_KEY)
+    if request_session is not None:
+        yield request_session
+        return
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -11,9 +11,14 @@
 #   - relationship("User", backref="games"): lets you access game.owner to get
 #     the User object, and user.games to get all their games — SQLAlchemy
 #     lazy-loads both directions automatically on first access.
+#   - Trigram GIN indexes on name/publisher/system (PostgreSQL only): the
+#     search endpoint matches with ILIKE '%term%', and a leading wildcard can't
+#     use a btree index. pg_trgm indexes can serve it, so search stays an
+#     index lookup instead of a full scan as the catalog grows. SQLite is only
+#     used for local development and keeps scanning.
 # =============================================================================
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -31,3 +36,27 @@ class Game(Base):
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     owner = relationship("User", backref="games")
+
+    __table_args__ = (
+        Index(
+            "ix_games_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_games_publisher_trgm", "publisher",
+            postgresql_using="gin", postgresql_ops={"publisher": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_games_system_trgm", "system",
+            postgresql_using="gin", postgresql_ops={"system": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# Runs on every create_all(), so the extension exists before the trigram
+# indexes are created even when the games table already exists.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -14,11 +14,18 @@
 #     SQLAlchemy needs explicit foreign_keys=[...] hints when there are multiple
 #     foreign keys pointing to the same table, otherwise it can't tell which
 #     relationship maps to which key.
+#   - Partial unique index on the game pair WHERE status = pending: the
+#     database itself rejects a duplicate pending offer, so create_trade_offer
+#     can insert with ON CONFLICT DO NOTHING instead of SELECT-then-INSERT
+#     (which also had a race window between the two statements).
+#   - Composite (proposer_id, recipient_id, status) index: the trade offer
+#     list filters on those columns together, so one index range covers the
+#     whole filter instead of intersecting single-column indexes.
 #
 # State machine: PENDING → ACCEPTED | REJECTED | CANCELLED (all terminal)
 # =============================================================================
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -46,6 +53,17 @@ class TradeOffer(Base):
     responded_at = Column(DateTime, nullable=True)
     message = Column(Text, nullable=True)
 
+    __table_args__ = (
+        Index("ix_trade_offers_participants", "proposer_id", "recipient_id", "status"),
+        Index(
+            "ix_trade_offers_pending_pair",
+            "proposer_id", "recipient_id", "offered_game_id", "requested_game_id",
+            unique=True,
+            postgresql_where=(status == TradeOfferStatus.PENDING),
+            sqlite_where=(status == TradeOfferStatus.PENDING),
+        ),
+    )
+
     proposer = relationship("User", foreign_keys=[proposer_id], backref="proposed_trade_offers")
     recipient = relationship("User", foreign_keys=[recipient_id], backref="received_trade_offers")
     offered_game = relationship("Game", foreign_keys=[offered_game_id])
@@ -12,13 +12,28 @@
 #     the dynamic route. Explicit ordering prevents this.
 #   - ilike() for text searches: case-insensitive LIKE. Works on both SQLite
 #     (case-insensitive by default) and PostgreSQL (where LIKE is case-sensitive).
+#   - GET /games skips the ORM and Pydantic: rows come back as plain mappings
+#     and are returned through ORJSONResponse, so a large listing is encoded
+#     once by orjson instead of being hydrated, revalidated, then serialized.
+#     Every other route builds its body with game_payload() and returns an
+#     ORJSONResponse too, so no response goes through jsonable_encoder or
+#     response validation. Routes set response_model=None and list the
+#     response schema under `responses` so it still shows up in the docs.
+#   - /search needs at least one filter and is capped by `limit` (default 100):
+#     an unfiltered search would just be an unbounded SELECT * FROM games, and
+#     the cap keeps search latency flat no matter how big the catalog gets.
+#   - Lookups by id use await db.get(), which returns an object already in the
+#     session's identity map without a round-trip and otherwise issues a
+#     primary-key SELECT that SQLAlchemy compiles once and caches.
 #   - No auth on read endpoints: games are a public listing — anyone can browse
 #     what's available for trade without needing an account.
 # =============================================================================
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 
 from app.database import get_db
 from app.models import Game, User
@@ -27,17 +42,33 @@ from app.utils import build_game_links
 
 router = APIRouter(prefix="/games", tags=["games"])
 
+GAME_ROWS = select(Game.__table__)
 
-@router.get("", response_model=List[GameResponse])
-def get_all_games(db: Session = Depends(get_db)):
-    games = db.query(Game).all()
-    for game in games:
-        game._links = build_game_links(game.id, game.owner_id)
-    return games
 
+def game_payload(game: Game) -> Dict[str, Any]:
+    return {
+        "id": game.id,
+        "name": game.name,
+        "publisher": game.publisher,
+        "year_published": game.year_published,
+        "system": game.system,
+        "condition": game.condition,
+        "previous_owners": game.previous_owners,
+        "owner_id": game.owner_id,
+        "_links": build_game_links(game.id, game.owner_id)
+    }
 
-@router.get("/search", response_model=List[GameResponse])
-def search_games(
+
+@router.get("", response_model=None, responses={200: {"model": List[GameResponse]}})
+async def get_all_games(db: AsyncSession = Depends(get_db)):
+    return ORJSONResponse([
+        {**row, "_links": build_game_links(row["id"], row["owner_id"])}
+        for row in (await db.execute(GAME_ROWS)).mappings()
+    ])
+
+
+@router.get("/search", response_model=None, responses={200: {"model": List[GameResponse]}})
+async def search_games(
     name: Optional[str] = Query(None, description="Name of the game to search for"),
     publisher: Optional[str] = Query(None, description="Publisher to filter by"),
     system: Optional[str] = Query(None, description="Gaming system to filter by"),
@@ -45,34 +76,38 @@ def search_games(
     owner_id: Optional[int] = Query(None, description="Owner ID to filter by"),
     year_before: Optional[int] = Query(None, description="Filter games published before this year"),
     year_after: Optional[int] = Query(None, description="Filter games published after this year"),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of games to return"),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Game)
-
+    filters = []
     if name:
-        query = query.filter(Game.name.ilike(f"%{name}%"))
+        filters.append(Game.name.ilike(f"%{name}%"))
     if publisher:
-        query = query.filter(Game.publisher.ilike(f"%{publisher}%"))
+        filters.append(Game.publisher.ilike(f"%{publisher}%"))
     if system:
-        query = query.filter(Game.system.ilike(f"%{system}%"))
+        filters.append(Game.system.ilike(f"%{system}%"))
     if condition:
-        query = query.filter(Game.condition == condition)
+        filters.append(Game.condition == condition)
     if owner_id is not None:
-        query = query.filter(Game.owner_id == owner_id)
+        filters.append(Game.owner_id == owner_id)
     if year_before is not None:
-        query = query.filter(Game.year_published < year_before)
+        filters.append(Game.year_published < year_before)
     if year_after is not None:
-        query = query.filter(Game.year_published > year_after)
+        filters.append(Game.year_published > year_after)
+
+    if not filters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one search filter is required"
+        )
 
-    games = query.all()
-    for game in games:
-        game._links = build_game_links(game.id, game.owner_id)
-    return games
+    query = select(Game).where(*filters).limit(limit)
+    return ORJSONResponse([game_payload(game) for game in (await db.scalars(query))])
 
 
-@router.post("", response_model=GameResponse, status_code=status.HTTP_201_CREATED)
-def create_game(game: GameCreate, db: Session = Depends(get_db)):
-    owner = db.query(User).filter(User.id == game.owner_id).first()
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=None, responses={201: {"model": GameResponse}})
+async def create_game(game: GameCreate, db: AsyncSession = Depends(get_db)):
+    owner = await db.get(User, game.owner_id)
     if not owner:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Owner not found")
 
@@ -86,29 +121,26 @@ def create_game(game: GameCreate, db: Session = Depends(get_db)):
         owner_id=game.owner_id
     )
     db.add(db_game)
-    db.commit()
-    db.refresh(db_game)
+    await db.commit()
 
-    db_game._links = build_game_links(db_game.id, db_game.owner_id)
-    return db_game
+    return ORJSONResponse(game_payload(db_game), status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{game_id}", response_model=GameResponse)
-def get_game(game_id: int, db: Session = Depends(get_db)):
-    game = db.query(Game).filter(Game.id == game_id).first()
+@router.get("/{game_id}", response_model=None, responses={200: {"model": GameResponse}})
+async def get_game(game_id: int, db: AsyncSession = Depends(get_db)):
+    game = await db.get(Game, game_id)
     if not game:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
-    game._links = build_game_links(game.id, game.owner_id)
-    return game
+    return ORJSONResponse(game_payload(game))
 
 
-@router.put("/{game_id}", response_model=GameResponse)
-def replace_game(game_id: int, game: GameCreate, db: Session = Depends(get_db)):
-    db_game = db.query(Game).filter(Game.id == game_id).first()
+@router.put("/{game_id}", response_model=None, responses={200: {"model": GameResponse}})
+async def replace_game(game_id: int, game: GameCreate, db: AsyncSession = Depends(get_db)):
+    db_game = await db.get(Game, game_id)
     if not db_game:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
 
-    owner = db.query(User).filter(User.id == game.owner_id).first()
+    owner = await db.get(User, game.owner_id)
     if not owner:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Owner not found")
 
@@ -119,16 +151,14 @@ def replace_game(game_id: int, game: GameCreate, db: Session = Depends(get_db)):
     db_game.condition = game.condition
     db_game.previous_owners = game.previous_owners
     db_game.owner_id = game.owner_id
-    db.commit()
-    db.refresh(db_game)
+    await db.commit()
 
-    db_game._links = build_game_links(db_game.id, db_game.owner_id)
-    return db_game
+    return ORJSONResponse(game_payload(db_game))
 
 
-@router.patch("/{game_id}", response_model=GameResponse)
-def update_game(game_id: int, game: GameUpdate, db: Session = Depends(get_db)):
-    db_game = db.query(Game).filter(Game.id == game_id).first()
+@router.patch("/{game_id}", response_model=None, responses={200: {"model": GameResponse}})
+async def update_game(game_id: int, game: GameUpdate, db: AsyncSession = Depends(get_db)):
+    db_game = await db.get(Game, game_id)
     if not db_game:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
 
@@ -145,18 +175,16 @@ def update_game(game_id: int, game: GameUpdate, db: Session = Depends(get_db)):
     if game.previous_owners is not None:
         db_game.previous_owners = game.previous_owners
 
-    db.commit()
-    db.refresh(db_game)
+    await db.commit()
 
-    db_game._links = build_game_links(db_game.id, db_game.owner_id)
-    return db_game
+    return ORJSONResponse(game_payload(db_game))
 
 
 @router.delete("/{game_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_game(game_id: int, db: Session = Depends(get_db)):
-    db_game = db.query(Game).filter(Game.id == game_id).first()
+async def delete_game(game_id: int, db: AsyncSession = Depends(get_db)):
+    db_game = await db.get(Game, game_id)
     if not db_game:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
-    db.delete(db_game)
-    db.commit()
+    await db.delete(db_game)
+    await db.commit()
     return None
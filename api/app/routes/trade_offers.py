@@ -12,65 +12,122 @@
 #     proposer can cancel. Enforced at the route level with explicit checks.
 #   - Kafka events on state changes: email notifications are decoupled from the
 #     API — we publish the event and the email service handles delivery async.
+#   - Offers are loaded with await db.get() (identity map first). Other fixed
+#     lookups are module-level select() statements with bindparam()
+#     placeholders, so their compiled SQL is cached and reused across requests.
+#   - create_trade_offer loads the requested game and the recipient in one
+#     query, and relies on the pending-pair unique index (see the model) with
+#     INSERT ... ON CONFLICT DO NOTHING instead of a separate duplicate check.
+#   - GET /trade-offers skips the ORM and Pydantic: rows come back as plain
+#     mappings and are returned through ORJSONResponse. Single offers are
+#     built by trade_offer_payload() and returned the same way.
 #   - Offered game auto-selection: picks the proposer's first game. A production
 #     app would let the client specify which of their games to offer.
 #
 # State machine: PENDING → ACCEPTED | REJECTED | CANCELLED (all terminal)
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select, bindparam, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+from app.auth import get_authenticated_user
 from app.database import get_db
 from app.models import User, Game, TradeOffer, TradeOfferStatus
 from app.schemas.schemas import TradeOfferCreate, TradeOfferResponse, TradeOfferUpdate
 from app.utils import build_trade_offer_links
-from app.auth import get_current_authenticated_user
 from app.kafka_producer import publish_notification_event
 
 router = APIRouter(prefix="/trade-offers", tags=["trade-offers"])
 
-
-@router.get("", response_model=List[TradeOfferResponse])
-def get_trade_offers(
+# Only the id and name are needed (for the insert and the Kafka event), so
+# skip hydrating Game objects and stop at the first row.
+FIRST_GAME_OF_OWNER = select(Game.id, Game.name).where(Game.owner_id == bindparam("owner_id")).limit(1)
+# Outer join so a missing recipient still returns the game row (with User None)
+# and the two "not found" cases can be told apart.
+REQUESTED_GAME_WITH_RECIPIENT = (
+    select(Game, User)
+    .outerjoin(User, User.id == bindparam("recipient_id"))
+    .where(Game.id == bindparam("game_id"))
+)
+
+INSERT_BY_DIALECT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# The only statuses a recipient may move a pending offer to.
+RECIPIENT_RESPONSE_STATUSES = frozenset({TradeOfferStatus.ACCEPTED, TradeOfferStatus.REJECTED})
+
+# Lazy loading isn't available on an AsyncSession, so the relationships the
+# notification event reads are joined in up front (one query instead of five).
+OFFER_WITH_PARTICIPANTS = [
+    joinedload(TradeOffer.proposer),
+    joinedload(TradeOffer.recipient),
+    joinedload(TradeOffer.offered_game),
+    joinedload(TradeOffer.requested_game),
+]
+
+
+def trade_offer_payload(offer: TradeOffer) -> Dict[str, Any]:
+    return {
+        "id": offer.id,
+        "proposer_id": offer.proposer_id,
+        "recipient_id": offer.recipient_id,
+        "offered_game_id": offer.offered_game_id,
+        "requested_game_id": offer.requested_game_id,
+        "status": offer.status,
+        "message": offer.message,
+        "created_at": offer.created_at,
+        "updated_at": offer.updated_at,
+        "responded_at": offer.responded_at,
+        "_links": build_trade_offer_links(offer.id)
+    }
+
+
+@router.get("", response_model=None, responses={200: {"model": List[TradeOfferResponse]}})
+async def get_trade_offers(
+    request: Request,
     status_filter: Optional[TradeOfferStatus] = Query(None, description="Filter by offer status"),
     recipient_id_filter: Optional[int] = Query(None, alias="recipient_id", description="Filter by recipient user ID"),
     proposer_id_filter: Optional[int] = Query(None, alias="proposer_id", description="Filter by proposer user ID"),
-    current_user: User = Depends(get_current_authenticated_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Returns all offers where the authenticated user is the proposer or recipient."""
-    query = db.query(TradeOffer).filter(
-        or_(
-            TradeOffer.proposer_id == current_user.id,
-            TradeOffer.recipient_id == current_user.id
-        )
-    )
-
+    current_user = get_authenticated_user(request)
+    filters = []
     if status_filter:
-        query = query.filter(TradeOffer.status == status_filter)
+        filters.append(TradeOffer.status == status_filter)
     if recipient_id_filter:
-        query = query.filter(TradeOffer.recipient_id == recipient_id_filter)
+        filters.append(TradeOffer.recipient_id == recipient_id_filter)
     if proposer_id_filter:
-        query = query.filter(TradeOffer.proposer_id == proposer_id_filter)
+        filters.append(TradeOffer.proposer_id == proposer_id_filter)
+
+    # An OR across proposer_id and recipient_id usually can't use either index,
+    # while each leg of the UNION ALL is a plain index lookup. Users can't
+    # trade with themselves, so no offer appears in both legs.
+    participant_offers = union_all(
+        select(TradeOffer).where(TradeOffer.proposer_id == current_user.id, *filters),
+        select(TradeOffer).where(TradeOffer.recipient_id == current_user.id, *filters)
+    ).subquery()
 
-    offers = query.order_by(TradeOffer.created_at.desc()).all()
-    for offer in offers:
-        offer._links = build_trade_offer_links(offer.id)
-    return offers
+    rows = (await db.execute(
+        select(participant_offers).order_by(participant_offers.c.created_at.desc())
+    )).mappings()
+    return ORJSONResponse([{**row, "_links": build_trade_offer_links(row["id"])} for row in rows])
 
 
-@router.get("/{offer_id}", response_model=TradeOfferResponse)
-def get_trade_offer(
+@router.get("/{offer_id}", response_model=None, responses={200: {"model": TradeOfferResponse}})
+async def get_trade_offer(
     offer_id: int,
-    current_user: User = Depends(get_current_authenticated_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Only the proposer or recipient can view a specific offer."""
-    offer = db.query(TradeOffer).filter(TradeOffer.id == offer_id).first()
+    current_user = get_authenticated_user(request)
+    offer = await db.get(TradeOffer, offer_id)
     if not offer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trade offer not found")
 
@@ -80,15 +137,14 @@ def get_trade_offer(
             detail="You are not authorized to view this trade offer"
         )
 
-    offer._links = build_trade_offer_links(offer.id)
-    return offer
+    return ORJSONResponse(trade_offer_payload(offer))
 
 
-@router.post("", response_model=TradeOfferResponse, status_code=status.HTTP_201_CREATED)
-def create_trade_offer(
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=None, responses={201: {"model": TradeOfferResponse}})
+async def create_trade_offer(
     offer_data: TradeOfferCreate,
-    current_user: User = Depends(get_current_authenticated_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a trade offer. The authenticated user is the proposer.
@@ -96,11 +152,15 @@ def create_trade_offer(
     Can't trade with yourself, both games must exist and be owned by the right
     users, and no duplicate pending offers for the same game pair are allowed.
     """
-    requested_game = db.query(Game).filter(Game.id == offer_data.requested_game_id).first()
-    if not requested_game:
+    current_user = get_authenticated_user(request)
+    requested_game_row = (await db.execute(REQUESTED_GAME_WITH_RECIPIENT, {
+        "game_id": offer_data.requested_game_id,
+        "recipient_id": offer_data.recipient_id
+    })).first()
+    if not requested_game_row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Requested game not found")
 
-    recipient = db.query(User).filter(User.id == offer_data.recipient_id).first()
+    requested_game, recipient = requested_game_row
     if not recipient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipient user not found")
 
@@ -118,41 +178,31 @@ def create_trade_offer(
 
     # Auto-select the proposer's first game. In production the client would
     # specify which of their games to put up for trade.
-    users_games = db.query(Game).filter(Game.owner_id == current_user.id).all()
-    if not users_games:
+    offered_game = (await db.execute(FIRST_GAME_OF_OWNER, {"owner_id": current_user.id})).first()
+    if offered_game is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You must own at least one game to create a trade offer"
         )
 
-    offered_game = users_games[0]
-
-    existing_offer = db.query(TradeOffer).filter(
-        TradeOffer.proposer_id == current_user.id,
-        TradeOffer.recipient_id == offer_data.recipient_id,
-        TradeOffer.offered_game_id == offered_game.id,
-        TradeOffer.requested_game_id == offer_data.requested_game_id,
-        TradeOffer.status == TradeOfferStatus.PENDING
-    ).first()
-
-    if existing_offer:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A pending trade offer for these games already exists"
-        )
-
-    new_offer = TradeOffer(
+    # A duplicate pending offer hits ix_trade_offers_pending_pair, so nothing
+    # is inserted and RETURNING comes back empty.
+    insert_offer = INSERT_BY_DIALECT[db.get_bind().dialect.name](TradeOffer).values(
         proposer_id=current_user.id,
         recipient_id=offer_data.recipient_id,
         offered_game_id=offered_game.id,
         requested_game_id=offer_data.requested_game_id,
         status=TradeOfferStatus.PENDING,
         message=offer_data.message
-    )
+    ).on_conflict_do_nothing().returning(TradeOffer)
 
-    db.add(new_offer)
-    db.commit()
-    db.refresh(new_offer)
+    new_offer = (await db.scalars(insert_offer)).one_or_none()
+    if new_offer is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A pending trade offer for these games already exists"
+        )
+    await db.commit()
 
     publish_notification_event(
         event_type='trade_offer_created',
@@ -170,22 +220,22 @@ def create_trade_offer(
         }
     )
 
-    new_offer._links = build_trade_offer_links(new_offer.id)
-    return new_offer
+    return ORJSONResponse(trade_offer_payload(new_offer), status_code=status.HTTP_201_CREATED)
 
 
-@router.patch("/{offer_id}", response_model=TradeOfferResponse)
-def respond_to_trade_offer(
+@router.patch("/{offer_id}", response_model=None, responses={200: {"model": TradeOfferResponse}})
+async def respond_to_trade_offer(
     offer_id: int,
     update_data: TradeOfferUpdate,
-    current_user: User = Depends(get_current_authenticated_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Accept or reject a pending offer. Only the recipient can respond.
     Valid transitions: PENDING → ACCEPTED or PENDING → REJECTED.
     """
-    offer = db.query(TradeOffer).filter(TradeOffer.id == offer_id).first()
+    current_user = get_authenticated_user(request)
+    offer = await db.get(TradeOffer, offer_id, options=OFFER_WITH_PARTICIPANTS)
     if not offer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trade offer not found")
 
@@ -201,7 +251,7 @@ def respond_to_trade_offer(
             detail=f"Cannot respond to an offer with status: {offer.status.value}"
         )
 
-    if update_data.status not in [TradeOfferStatus.ACCEPTED, TradeOfferStatus.REJECTED]:
+    if update_data.status not in RECIPIENT_RESPONSE_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Recipients can only accept or reject offers"
@@ -209,8 +259,7 @@ def respond_to_trade_offer(
 
     offer.status = update_data.status
     offer.responded_at = datetime.utcnow()
-    db.commit()
-    db.refresh(offer)
+    await db.commit()
 
     event_type = 'trade_offer_accepted' if update_data.status == TradeOfferStatus.ACCEPTED else 'trade_offer_rejected'
     publish_notification_event(
@@ -229,18 +278,18 @@ def respond_to_trade_offer(
         }
     )
 
-    offer._links = build_trade_offer_links(offer.id)
-    return offer
+    return ORJSONResponse(trade_offer_payload(offer))
 
 
 @router.delete("/{offer_id}", status_code=status.HTTP_204_NO_CONTENT)
-def cancel_trade_offer(
+async def cancel_trade_offer(
     offer_id: int,
-    current_user: User = Depends(get_current_authenticated_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Cancel a pending offer. Only the proposer can cancel."""
-    offer = db.query(TradeOffer).filter(TradeOffer.id == offer_id).first()
+    current_user = get_authenticated_user(request)
+    offer = await db.get(TradeOffer, offer_id)
     if not offer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trade offer not found")
 
@@ -257,5 +306,5 @@ def cancel_trade_offer(
         )
 
     offer.status = TradeOfferStatus.CANCELLED
-    db.commit()
+    await db.commit()
     return None
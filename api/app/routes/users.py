@@ -13,33 +13,60 @@
 #   - password_changed flag: tracks whether password was touched during an update
 #     so we only fire the Kafka notification when it actually changed.
 #   - Passwords are hashed via bcrypt on every write (create, PUT, PATCH).
+#   - GET /users skips the ORM and Pydantic: the public columns come back as
+#     plain mappings and go straight out through ORJSONResponse. The column
+#     list is explicit so the password hash can never end up in the output.
+#     Single-user responses go through user_payload(), which is explicit for
+#     the same reason, and are returned as ORJSONResponse as well.
+#   - Lookups by id use await db.get(), which skips SQL entirely when the user is
+#     already in the session's identity map. Email lookups are module-level
+#     select() statements with bindparam() placeholders, so their compiled SQL
+#     is cached and reused across requests.
 # =============================================================================
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List
 
 from app.database import get_db
 from app.models import User
 from app.schemas.schemas import UserCreate, UserResponse, UserUpdate, Error
 from app.utils import build_user_links
-from app.auth import get_password_hash
+from app.auth import get_password_hash, invalidate_cached_credentials
 from app.kafka_producer import publish_notification_event
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+USER_ROWS = select(User.id, User.name, User.email, User.street_address)
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+OTHER_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"), User.id != bindparam("user_id"))
 
-@router.get("", response_model=List[UserResponse])
-def get_all_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-    for user in users:
-        user._links = build_user_links(user.id)
-    return users
 
+def user_payload(user: User) -> Dict[str, Any]:
+    # Spelled out field by field so the password hash can never leak into a response.
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "street_address": user.street_address,
+        "_links": build_user_links(user.id)
+    }
 
-@router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user.email).first()
+
+@router.get("", response_model=None, responses={200: {"model": List[UserResponse]}})
+async def get_all_users(db: AsyncSession = Depends(get_db)):
+    return ORJSONResponse([
+        {**row, "_links": build_user_links(row["id"])}
+        for row in (await db.execute(USER_ROWS)).mappings()
+    ])
+
+
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=None, responses={201: {"model": UserResponse}})
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    existing_user = (await db.execute(USER_BY_EMAIL, {"email": user.email})).scalar_one_or_none()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -49,48 +76,46 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = User(
         name=user.name,
         email=user.email,
-        password=get_password_hash(user.password),
+        password=await run_in_threadpool(get_password_hash, user.password),
         street_address=user.street_address
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    invalidate_cached_credentials(db_user.email)
 
-    db_user._links = build_user_links(db_user.id)
-    return db_user
+    return ORJSONResponse(user_payload(db_user), status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+@router.get("/{user_id}", response_model=None, responses={200: {"model": UserResponse}})
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    user._links = build_user_links(user.id)
-    return user
+    return ORJSONResponse(user_payload(user))
 
 
-@router.put("/{user_id}", response_model=UserResponse)
-def replace_user(user_id: int, user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
+@router.put("/{user_id}", response_model=None, responses={200: {"model": UserResponse}})
+async def replace_user(user_id: int, user: UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await db.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    existing_user = db.query(User).filter(
-        User.email == user.email,
-        User.id != user_id
-    ).first()
+    existing_user = (await db.execute(
+        OTHER_USER_BY_EMAIL, {"email": user.email, "user_id": user_id}
+    )).scalar_one_or_none()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already in use by another user"
         )
 
+    previous_email = db_user.email
     db_user.name = user.name
     db_user.email = user.email
-    db_user.password = get_password_hash(user.password)
+    db_user.password = await run_in_threadpool(get_password_hash, user.password)
     db_user.street_address = user.street_address
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    invalidate_cached_credentials(previous_email, db_user.email)
 
     publish_notification_event(
         event_type='password_changed',
@@ -101,14 +126,13 @@ def replace_user(user_id: int, user: UserCreate, db: Session = Depends(get_db)):
         }
     )
 
-    db_user._links = build_user_links(db_user.id)
-    return db_user
+    return ORJSONResponse(user_payload(db_user))
 
 
-@router.patch("/{user_id}", response_model=UserResponse)
-def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
+@router.patch("/{user_id}", response_model=None, responses={200: {"model": UserResponse}})
+async def update_user(user_id: int, user: UserUpdate, db: AsyncSession = Depends(get_db)):
     """Partial update — email is immutable, only name/address/password can change."""
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = await db.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -119,13 +143,13 @@ def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
     if user.street_address is not None:
         db_user.street_address = user.street_address
     if user.password is not None:
-        db_user.password = get_password_hash(user.password)
+        db_user.password = await run_in_threadpool(get_password_hash, user.password)
         password_changed = True
 
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
 
     if password_changed:
+        invalidate_cached_credentials(db_user.email)
         publish_notification_event(
             event_type='password_changed',
             data={
@@ -135,15 +159,16 @@ def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
             }
         )
 
-    db_user._links = build_user_links(db_user.id)
-    return db_user
+    return ORJSONResponse(user_payload(db_user))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    db_user = await db.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    db.delete(db_user)
-    db.commit()
+    deleted_email = db_user.email
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_cached_credentials(deleted_email)
     return None
@@ -13,12 +13,16 @@
 #     fields Optional for PATCH support, Response adds read-only fields (id, links).
 #   - HATEOAS _links on every response: each resource tells the client what
 #     actions are available next, following REST level 3 maturity.
-#   - from_attributes = True (formerly orm_mode): tells Pydantic to read data
+#   - from_attributes=True (formerly orm_mode): tells Pydantic to read data
 #     from SQLAlchemy model attributes instead of requiring a plain dict.
+#   - The *Response models document the OpenAPI schema only: routes return
+#     ORJSONResponse payloads and register these under `responses=`, so they
+#     never validate or serialize an outgoing response.
 # =============================================================================
 
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 from app.models import TradeOfferStatus
@@ -31,12 +35,31 @@ class Condition(str, Enum):
     poor = "poor"
 
 
-class Links(BaseModel):
+# Link sets are plain slotted dataclasses rather than models: they only ever
+# hold paths built by app/utils.py, so there is nothing to validate, and
+# orjson serializes dataclasses natively. They're frozen because the link
+# builders cache and share instances across responses.
+@dataclass(slots=True, frozen=True)
+class UserLinks:
     self: str
-    update: Optional[str] = None
-    delete: Optional[str] = None
-    owner: Optional[str] = None
-    games: Optional[str] = None
+    update: str
+    delete: str
+    games: str
+
+
+@dataclass(slots=True, frozen=True)
+class GameLinks:
+    self: str
+    update: str
+    delete: str
+    owner: str
+
+
+@dataclass(slots=True, frozen=True)
+class TradeOfferLinks:
+    self: str
+    respond: str
+    cancel: str
 
 
 class UserBase(BaseModel):
@@ -57,10 +80,9 @@ class UserUpdate(BaseModel):
 
 class UserResponse(UserBase):
     id: int
-    _links: Links
+    _links: UserLinks
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GameBase(BaseModel):
@@ -88,16 +110,15 @@ class GameUpdate(BaseModel):
 class GameResponse(GameBase):
     id: int
     owner_id: int
-    _links: Links
+    _links: GameLinks
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Error(BaseModel):
     code: int
     message: str
-    details: Optional[str] = None
+    details: Optional[List[Dict[str, Any]]] = None
 
 
 class TradeOfferBase(BaseModel):
@@ -127,7 +148,6 @@ class TradeOfferResponse(TradeOfferBase):
     created_at: datetime
     updated_at: datetime
     responded_at: Optional[datetime] = None
-    _links: Links
+    _links: TradeOfferLinks
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -11,32 +11,59 @@
 #   A client that follows links from the API can navigate the whole system
 #   without knowing URL patterns ahead of time. If we rename a route, we only
 #   update it here — clients that follow links just work without any changes.
+#
+# Why dataclasses:
+#   List endpoints build one set of links per row. Every value here is a path
+#   we just formatted ourselves, so there is nothing for Pydantic to validate.
+#   The *Links dataclasses in schemas.py have one slot per link the resource
+#   actually has, and orjson writes them out like dicts. Each path is
+#   %-formatted once per call and the same string is reused for every link
+#   that points at it (self/update/delete are all the resource URL).
+#
+# Why lru_cache:
+#   The links are a pure function of the ids, and the same users, games and
+#   offers are served over and over, so each builder remembers its last 4096
+#   results. Cached link objects are shared between responses, which is safe
+#   because the *Links dataclasses are frozen.
 # =============================================================================
 
-from app.schemas.schemas import Links
+from functools import lru_cache
+
+from app.schemas.schemas import GameLinks, TradeOfferLinks, UserLinks
+
+USER_PATH = "/users/%d"
+USER_GAMES_PATH = "/games?ownerId=%d"
+GAME_PATH = "/games/%d"
+TRADE_OFFER_PATH = "/trade-offers/%d"
 
 
-def build_user_links(user_id: int) -> Links:
-    return Links(
-        self=f"/users/{user_id}",
-        update=f"/users/{user_id}",
-        delete=f"/users/{user_id}",
-        games=f"/games?ownerId={user_id}"
+@lru_cache(maxsize=4096)
+def build_user_links(user_id: int) -> UserLinks:
+    user_path = USER_PATH % user_id
+    return UserLinks(
+        self=user_path,
+        update=user_path,
+        delete=user_path,
+        games=USER_GAMES_PATH % user_id
     )
 
 
-def build_game_links(game_id: int, owner_id: int) -> Links:
-    return Links(
-        self=f"/games/{game_id}",
-        update=f"/games/{game_id}",
-        delete=f"/games/{game_id}",
-        owner=f"/users/{owner_id}"
+@lru_cache(maxsize=4096)
+def build_game_links(game_id: int, owner_id: int) -> GameLinks:
+    game_path = GAME_PATH % game_id
+    return GameLinks(
+        self=game_path,
+        update=game_path,
+        delete=game_path,
+        owner=USER_PATH % owner_id
     )
 
 
-def build_trade_offer_links(offer_id: int) -> Links:
-    return Links(
-        self=f"/trade-offers/{offer_id}",
-        respond=f"/trade-offers/{offer_id}",
-        cancel=f"/trade-offers/{offer_id}"
+@lru_cache(maxsize=4096)
+def build_trade_offer_links(offer_id: int) -> TradeOfferLinks:
+    trade_offer_path = TRADE_OFFER_PATH % offer_id
+    return TradeOfferLinks(
+        self=trade_offer_path,
+        respond=trade_offer_path,
+        cancel=trade_offer_path
     )
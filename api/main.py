@@ -6,65 +6,92 @@
 #   cross-cutting concerns: Prometheus metrics collection and Kafka shutdown.
 #
 # Key decisions:
+#   - BasicAuthASGIMiddleware: authenticates /trade-offers requests once at the
+#     ASGI layer (see auth.py) instead of per-route dependencies.
+#     add_basic_auth_to_openapi() documents the scheme for /docs instead.
 #   - Prometheus Instrumentator: auto-instruments every route so we get request
 #     count, latency, and status codes at /metrics with zero manual code.
+#   - APP_CREATE_TABLES=1: only then does startup create missing tables and
+#     indexes. Set it for one process (local dev, the first compose instance),
+#     or run seed_data.py, which always creates the schema before seeding.
 #   - atexit.register: guarantees Kafka's internal message buffer is flushed
 #     before the process exits — important for not losing in-flight events.
+#   - default_response_class=ORJSONResponse: routes return ORJSONResponse
+#     payloads themselves (see routes/), and anything else is encoded by
+#     orjson as well. GET / goes further and sends bytes encoded at import.
 #   - Global exception handlers: normalizes all errors into a consistent JSON
 #     shape { code, message } rather than FastAPI's default validation format.
 # =============================================================================
 
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import atexit
+import os
+import orjson
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from app.database import engine, Base
+from app.database import create_database_schema
+from app.auth import BasicAuthASGIMiddleware, add_basic_auth_to_openapi
 from app.routes import users, games, trade_offers
 from app.schemas.schemas import Error
 from app.kafka_producer import flush_kafka_producer
 
-Base.metadata.create_all(bind=engine)
+# DDL is opt-in: with several workers or instances, each one would otherwise
+# inspect the schema (and race to create it) on every start.
+if os.getenv("APP_CREATE_TABLES") == "1":
+    create_database_schema()
 
 atexit.register(flush_kafka_producer)
 
 app = FastAPI(
     title="Video Game Exchange API",
     description="RESTful API for exchanging retro video games between users",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-app.include_router(users.router)
-app.include_router(games.router)
-app.include_router(trade_offers.router)
+app.add_middleware(BasicAuthASGIMiddleware)
+
+for router in (users.router, games.router, trade_offers.router):
+    app.include_router(router)
+
+add_basic_auth_to_openapi(app)
 
 # Hooks into FastAPI's middleware chain to track every request automatically.
 # Exposes collected metrics at GET /metrics — that's what Prometheus scrapes.
 Instrumentator().instrument(app).expose(app)
 
 
-@app.get("/", tags=["root"])
-def read_root():
-    return {
-        "message": "Retro Video Game Exchange API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "_links": {
-            "self": "/",
-            "users": "/users",
-            "games": "/games",
-            "games_search": "/games/search",
-            "trade_offers": "/trade-offers",
-            "docs": "/docs"
-        }
+# The root document never changes, so it's encoded once at import and every
+# request just sends the same bytes.
+ROOT_RESPONSE_BODY = orjson.dumps({
+    "message": "Retro Video Game Exchange API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "_links": {
+        "self": "/",
+        "users": "/users",
+        "games": "/games",
+        "games_search": "/games/search",
+        "trade_offers": "/trade-offers",
+        "docs": "/docs"
     }
+})
+
+
+@app.get("/", tags=["root"])
+async def read_root():
+    return Response(content=ROOT_RESPONSE_BODY, media_type="application/json")
 
 
+# The handlers stay `async def` even though they never await: Starlette calls
+# async handlers directly but sends plain `def` handlers through
+# run_in_threadpool, which costs a thread hop on every error response.
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"code": exc.status_code, "message": exc.detail}
     )
@@ -72,7 +99,15 @@ async def http_exception_handler(request, exc):
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request, exc):
-    return JSONResponse(
+    # exc.errors() is already a list of plain dicts (loc, msg, type, ...), which
+    # orjson encodes straight to bytes; str(exc) would format every error into
+    # one string. An error's ctx can hold the exception a validator raised,
+    # which orjson can't encode on its own, hence default=str.
+    return Response(
+        content=orjson.dumps(
+            {"code": 400, "message": "Validation error", "details": exc.errors()},
+            default=str
+        ),
         status_code=400,
-        content={"code": 400, "message": "Validation error", "details": str(exc)}
+        media_type="application/json"
     )
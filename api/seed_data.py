@@ -1,9 +1,12 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import insert, select
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal, create_database_schema
 from app.models import User, Game
 from app.auth import get_password_hash
 
@@ -16,100 +19,114 @@ def create_sample_data():
     - 3 sample users with hashed passwords
     - 3 games distributed among the users (Minecraft, Animal Crossing, Among Us)
     """
-    Base.metadata.create_all(bind=engine)
-
-    database_session = SessionLocal()
+    create_database_schema()
 
+    # One transaction for the whole seed: SessionLocal.begin() commits when the
+    # block exits and rolls back if anything inside it raises.
     try:
-        existing_users = database_session.query(User).count()
-        if existing_users > 0:
-            print(f"Database already has {existing_users} users. Skipping seed data creation.")
-            return
-
-        print("Creating sample data...")
-
-        users_data = [
-            {
-                "name": "Alice Gamer",
-                "email": "alice@example.com",
-                "password": get_password_hash("gamer123"),
-                "street_address": "123 Minecraft Lane, Blockville"
-            },
-            {
-                "name": "Bob Trader",
-                "email": "bob@example.com",
-                "password": get_password_hash("trader456"),
-                "street_address": "456 Island Road, Paradise Isle"
-            },
-            {
-                "name": "Carol Swapper",
-                "email": "carol@example.com",
-                "password": get_password_hash("swapper789"),
-                "street_address": "789 Space Station, Orbit City"
-            }
-        ]
-
-        created_users = []
-        for user_data in users_data:
-            user = User(**user_data)
-            database_session.add(user)
-            database_session.flush() 
-            created_users.append(user)
-            print(f"  Created user: {user.name} ({user.email})")
-
-        # Create sample games
-        # Alice owns Minecraft
-        # Bob owns Animal Crossing: New Horizons
-        # Carol owns Among Us
-        games_data = [
-            {
-                "name": "Minecraft",
-                "publisher": "Mojang Studios",
-                "year_published": 2011,
-                "system": "Multi-platform",
-                "condition": "good",
-                "previous_owners": 2,
-                "owner_id": created_users[0].id
-            },
-            {
-                "name": "Animal Crossing: New Horizons",
-                "publisher": "Nintendo",
-                "year_published": 2020,
-                "system": "Switch",
-                "condition": "mint",
-                "previous_owners": 0,
-                "owner_id": created_users[1].id
-            },
-            {
-                "name": "Among Us",
-                "publisher": "InnerSloth",
-                "year_published": 2018,
-                "system": "Multi-platform",
-                "condition": "fair",
-                "previous_owners": 1,
-                "owner_id": created_users[2].id
-            }
+        with SessionLocal.begin() as database_session:
+            # LIMIT 1 probe: stops at the first row instead of counting them all.
+            if database_session.execute(select(User.id).limit(1)).first() is not None:
+                print("Database already has users. Skipping seed data creation.")
+                return
+
+            # Progress lines are collected and written in one go once the
+            # transaction has committed, instead of a write per print().
+            output_lines = ["Creating sample data..."]
+
+            # bcrypt releases the GIL while hashing, so threads run the three
+            # hashes in parallel without the start-up cost of a process pool.
+            with ThreadPoolExecutor() as executor:
+                alice_hash, bob_hash, carol_hash = executor.map(
+                    get_password_hash, ["gamer123", "trader456", "swapper789"]
+                )
+
+            users_data = [
+                {
+                    "name": "Alice Gamer",
+                    "email": "alice@example.com",
+                    "password": alice_hash,
+                    "street_address": "123 Minecraft Lane, Blockville"
+                },
+                {
+                    "name": "Bob Trader",
+                    "email": "bob@example.com",
+                    "password": bob_hash,
+                    "street_address": "456 Island Road, Paradise Isle"
+                },
+                {
+                    "name": "Carol Swapper",
+                    "email": "carol@example.com",
+                    "password": carol_hash,
+                    "street_address": "789 Space Station, Orbit City"
+                }
+            ]
+
+            # One multi-row INSERT ... RETURNING for all users instead of an
+            # add() + flush() round trip per user just to learn its id.
+            created_users = database_session.execute(
+                insert(User).returning(User.id, User.name, User.email, sort_by_parameter_order=True),
+                users_data
+            ).all()
+            output_lines.extend(f"  Created user: {user.name} ({user.email})" for user in created_users)
+
+            # Create sample games, one per user in users_data order:
+            # Alice owns Minecraft
+            # Bob owns Animal Crossing: New Horizons
+            # Carol owns Among Us
+            game_templates = [
+                {
+                    "name": "Minecraft",
+                    "publisher": "Mojang Studios",
+                    "year_published": 2011,
+                    "system": "Multi-platform",
+                    "condition": "good",
+                    "previous_owners": 2
+                },
+                {
+                    "name": "Animal Crossing: New Horizons",
+                    "publisher": "Nintendo",
+                    "year_published": 2020,
+                    "system": "Switch",
+                    "condition": "mint",
+                    "previous_owners": 0
+                },
+                {
+                    "name": "Among Us",
+                    "publisher": "InnerSloth",
+                    "year_published": 2018,
+                    "system": "Multi-platform",
+                    "condition": "fair",
+                    "previous_owners": 1
+                }
+            ]
+
+            # RETURNING came back in users_data order, so each template pairs
+            # with its owner's row directly.
+            games_data = [
+                {**game_template, "owner_id": owner.id}
+                for game_template, owner in zip(game_templates, created_users)
+            ]
+            database_session.execute(insert(Game), games_data)
+            output_lines.extend(
+                f"  Created game: {game_data['name']} (owned by {owner.name})"
+                for game_data, owner in zip(games_data, created_users)
+            )
+
+        output_lines += [
+            "",
+            "Sample data created successfully!",
+            "",
+            "Test credentials:",
+            "  alice@example.com / gamer123 (owns Minecraft)",
+            "  bob@example.com / trader456 (owns Animal Crossing: New Horizons)",
+            "  carol@example.com / swapper789 (owns Among Us)"
         ]
-
-        for game_data in games_data:
-            game = Game(**game_data)
-            database_session.add(game)
-            owner_name = next(u.name for u in created_users if u.id == game_data["owner_id"])
-            print(f"  Created game: {game.name} (owned by {owner_name})")
-
-        database_session.commit()
-        print("\nSample data created successfully!")
-        print("\nTest credentials:")
-        print("  alice@example.com / gamer123 (owns Minecraft)")
-        print("  bob@example.com / trader456 (owns Animal Crossing: New Horizons)")
-        print("  carol@example.com / swapper789 (owns Among Us)")
+        sys.stdout.write("\n".join(output_lines) + "\n")
 
     except Exception as error:
         print(f"Error creating sample data: {error}")
-        database_session.rollback()
         raise
-    finally:
-        database_session.close()
 
 
 if __name__ == "__main__":